@@ -2,61 +2,195 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import configparser
 import os
-import re
-import time
+import functools
+import gzip
+import hashlib
+import json
+import logging
 import threading
 import webbrowser
 import platform
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Tuple, Iterator, Optional, Any
 from datetime import datetime
 
 # 外部ライブラリ
 import pandas as pd
-from pypdf import PdfReader
+from openpyxl import Workbook
+import fitz  # PyMuPDF
+
+# 任意: 複数キーワードを1パスで検索するAho-Corasick (未インストール時はキーワードごとの検索)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+logger = logging.getLogger(__name__)
+
+# 検索結果1件の列順 (Treeviewの列順と同じ)。内部ではこの順のタプルで保持する
+RESULT_COLUMNS = ["file_name", "page", "context", "file_path"]
+
+
+@functools.lru_cache(maxsize=8)
+def _build_automaton(kw_lowers: Tuple[str, ...]):
+    """複数キーワード用のオートマトンを作成 (同じキーワード集合なら再利用)"""
+    automaton = ahocorasick.Automaton()
+    for kw in kw_lowers:
+        automaton.add_word(kw, kw)
+    automaton.make_automaton()
+    return automaton
+
+
+def parse_keywords(keyword: str, multi: bool = False) -> Tuple[str, ...]:
+    """キーワードを小文字化したタプルにする
+
+    multi=True のときだけカンマ区切りで複数語に分けて重複を除く ("1,000円" などを分割しないため既定は1語)
+    """
+    if not multi:
+        return (keyword.lower(),)
+    kws = (k.strip().lower() for k in keyword.split(','))
+    return tuple(dict.fromkeys(k for k in kws if k)) or (keyword.lower(),)
 
 # =============================================================================
 # 2. ini設定の読み書き関数 / クラス
 # =============================================================================
 class ConfigManager:
-    """設定ファイル(config.ini)の管理を行うクラス"""
+    """設定ファイル(config.json)の管理を行うクラス"""
     
     DEFAULT_CONFIG = {
         'Settings': {
             'target_folder': '',
             'search_keyword': '',
             'file_extension': '.pdf',
-            'context_length': '30'  # 検索ヒット時の文字数
+            'context_length': '30',  # 検索ヒット時の文字数
+            'max_hits_per_file': '5',  # 1ファイルあたりの最大ヒット数 (0で無制限)
+            'multi_keyword': '0'  # 1ならキーワードをカンマ区切りで複数語として扱う
         }
     }
     
-    def __init__(self, filename: str = 'config.ini'):
+    def __init__(self, filename: str = 'config.json', legacy_filename: str = 'config.ini'):
         self.filename = filename
-        self.config = configparser.ConfigParser()
+        self.legacy_filename = legacy_filename  # 旧形式(ini)の設定ファイル
+        # 読み込み済み設定のキャッシュ (ファイルのmtime, 設定)
+        self._cached_settings: Optional[Tuple[float, Dict[str, Any]]] = None
 
     def load_config(self) -> Dict[str, Any]:
-        """設定を読み込む。ファイルがない場合はデフォルトを返す"""
+        """設定を読み込む。ファイルがない場合はデフォルトを返す
+
+        ファイルが前回読み込み時から更新されていなければキャッシュを返す
+        """
+        if not os.path.exists(self.filename):
+            self._migrate_legacy_config()
         if not os.path.exists(self.filename):
             return self.DEFAULT_CONFIG['Settings'].copy()
         
         try:
-            self.config.read(self.filename, encoding='utf-8')
-            if 'Settings' in self.config:
-                return dict(self.config['Settings'])
+            mtime = os.path.getmtime(self.filename)
+            if self._cached_settings is not None and self._cached_settings[0] == mtime:
+                return self._cached_settings[1].copy()
+
+            with open(self.filename, 'rb') as f:
+                data = json.load(f)
+            if isinstance(data, dict) and isinstance(data.get('Settings'), dict):
+                settings = data['Settings']
             else:
-                return self.DEFAULT_CONFIG['Settings'].copy()
+                settings = self.DEFAULT_CONFIG['Settings'].copy()
+            self._cached_settings = (mtime, settings)
+            return settings.copy()
         except Exception as e:
             print(f"Config load error: {e}")
             return self.DEFAULT_CONFIG['Settings'].copy()
 
     def save_config(self, settings: Dict[str, str]) -> None:
         """設定を保存する"""
-        self.config['Settings'] = settings
+        self._cached_settings = None
         try:
             with open(self.filename, 'w', encoding='utf-8') as configfile:
-                self.config.write(configfile)
+                json.dump({'Settings': settings}, configfile, ensure_ascii=False, indent=2)
         except Exception as e:
             raise IOError(f"設定ファイルの保存に失敗しました: {e}")
 
+    def _migrate_legacy_config(self) -> None:
+        """旧形式のconfig.iniがあれば読み込み、JSON形式で保存し直す (初回のみ)"""
+        if not os.path.exists(self.legacy_filename):
+            return
+        try:
+            config = configparser.ConfigParser()
+            config.read(self.legacy_filename, encoding='utf-8')
+            if 'Settings' in config:
+                self.save_config(dict(config['Settings']))
+        except Exception as e:
+            print(f"Legacy config migration error: {e}")
+
+# =============================================================================
+# 抽出テキストのディスクキャッシュ
+# =============================================================================
+# PDFごとの抽出済みテキスト (ページ単位) を保存し、同じPDFの再検索ではPDF解析を省く
+TEXT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".pdfserch_cache")
+# キャッシュ全体の上限。超えた分は最近使われていないものから削除する
+TEXT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+def _text_cache_path(file_path: str, st: os.stat_result) -> str:
+    """キャッシュファイルのパス。キーにmtime・サイズを含めるので、PDFが更新されれば別ファイルになる"""
+    key = f"{os.path.abspath(file_path)}|{st.st_mtime_ns}|{st.st_size}"
+    return os.path.join(TEXT_CACHE_DIR, hashlib.sha1(key.encode('utf-8')).hexdigest() + ".json.gz")
+
+
+def load_text_cache(file_path: str, st: os.stat_result) -> Optional[List[str]]:
+    """キャッシュ済みのページテキスト一覧を返す。なければNone"""
+    cache_path = _text_cache_path(file_path, st)
+    try:
+        with gzip.open(cache_path, 'rt', encoding='utf-8') as f:
+            pages = json.load(f)
+    except (OSError, ValueError):
+        return None
+    try:
+        # 更新日時を使用日時として扱い、削除対象の判定に使う
+        os.utime(cache_path)
+    except OSError:
+        pass
+    return pages
+
+
+def save_text_cache(file_path: str, st: os.stat_result, pages: List[str]) -> None:
+    """ページテキスト一覧を保存する。失敗しても検索自体には影響させない"""
+    try:
+        os.makedirs(TEXT_CACHE_DIR, exist_ok=True)
+        cache_path = _text_cache_path(file_path, st)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(pages, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Text cache write error: {e}")
+
+
+def prune_text_cache(max_bytes: int = TEXT_CACHE_MAX_BYTES) -> None:
+    """キャッシュ全体が max_bytes を超えていれば、最近使われていないものから削除する
+
+    PDFが更新されると古いキーのエントリは使われなくなるため、それらもいずれここで消える。
+    """
+    entries = []
+    try:
+        with os.scandir(TEXT_CACHE_DIR) as it:
+            for entry in it:
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+    except OSError:
+        return
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
 # =============================================================================
 # 3. メイン処理関数 main_processor (ロジッククラス)
 # =============================================================================
@@ -66,61 +200,150 @@ class SearchLogic:
     def __init__(self):
         self.is_running = False
         self.cancel_flag = False
+        # フォルダごとのPDF一覧キャッシュ {folder_path: ({ディレクトリ: mtime}, PDF一覧)}
+        self._pdf_list_cache: Dict[str, Tuple[Dict[str, float], List[str]]] = {}
 
     def get_pdf_files(self, folder_path: str) -> List[str]:
-        """指定フォルダ以下のPDFファイルを再帰的に取得"""
-        pdf_files = []
-        for root, _, files in os.walk(folder_path):
-            for file in files:
-                if file.lower().endswith('.pdf'):
-                    pdf_files.append(os.path.join(root, file))
+        """指定フォルダ以下のPDFファイルを再帰的に取得
+
+        配下のどのディレクトリのmtimeも変わっていなければ前回の一覧をそのまま返す
+        (ファイルの追加・削除・改名は必ずそのディレクトリのmtimeを更新するため)
+        """
+        cached = self._pdf_list_cache.get(folder_path)
+        if cached is not None and self._dirs_unchanged(cached[0]):
+            return cached[1]
+
+        dir_mtimes = {}
+        pdf_files = list(self._iter_pdf_files(folder_path, dir_mtimes))
+        self._pdf_list_cache[folder_path] = (dir_mtimes, pdf_files)
         return pdf_files
 
-    def search_in_pdf(self, file_path: str, keyword: str, context_len: int = 30) -> List[Dict]:
-        """単一PDF内の検索実行"""
+    @staticmethod
+    def _iter_pdf_files(folder_path: str, dir_mtimes: Dict[str, float]) -> Iterator[str]:
+        """os.scandirでフォルダを走査し、PDFのパスを見つけ次第返す
+
+        DirEntryの種別情報を使うのでファイルごとのstatは発生しない。
+        走査したディレクトリのmtimeは dir_mtimes に記録する。
+        """
+        stack = [folder_path]
+        while stack:
+            current = stack.pop()
+            try:
+                dir_mtimes[current] = os.stat(current).st_mtime
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name[-4:].lower() == '.pdf':
+                            yield entry.path
+            except OSError:
+                # アクセスできないディレクトリはスキップ (os.walkと同じ挙動)
+                continue
+
+    @staticmethod
+    def _dirs_unchanged(dir_mtimes: Dict[str, float]) -> bool:
+        """キャッシュ作成時から各ディレクトリのmtimeが変わっていないか"""
+        try:
+            return all(os.stat(d).st_mtime == m for d, m in dir_mtimes.items())
+        except OSError:
+            # 削除されたディレクトリがある
+            return False
+
+    @staticmethod
+    def _find_matches(low: str, kw_lowers: Tuple[str, ...]) -> List[Tuple[int, int]]:
+        """小文字化済みの本文からキーワードの出現位置 (開始位置, 長さ) を列挙する"""
+        if len(kw_lowers) > 1 and ahocorasick is not None:
+            # 全キーワードを1回の走査でまとめて検出
+            return [(end_idx - len(kw) + 1, len(kw)) for end_idx, kw in _build_automaton(kw_lowers).iter(low)]
+
+        matches = []
+        for kw in kw_lowers:
+            # C実装の包含判定で先にふるい落とし、ヒットしないページは位置収集を行わない
+            if kw not in low:
+                continue
+            klen = len(kw)
+            pos = 0
+            while True:
+                idx = low.find(kw, pos)
+                if idx < 0:
+                    break
+                matches.append((idx, klen))
+                pos = idx + klen
+        if len(kw_lowers) > 1:
+            matches.sort()
+        return matches
+
+    @staticmethod
+    def _extract_page_texts(doc, file_path: str, extracted: List[Optional[str]]) -> Iterator[str]:
+        """ページテキストを1ページずつ抽出して返す
+
+        抽出結果は extracted にも追加する (失敗したページはNone)。呼び出し側が途中で
+        ループを抜ければ、残りのページは抽出されない。
+        """
+        for page in doc:
+            try:
+                text = page.get_text("text")
+            except Exception:
+                # ページ読み込みエラーはログに残すが処理は継続
+                logger.debug("Page text extraction failed: %s (page %d)", file_path, len(extracted) + 1, exc_info=True)
+                text = None
+            extracted.append(text)
+            yield text or ""
+
+    def search_in_pdf(self, file_path: str, kw_lowers: Tuple[str, ...], context_len: int = 30,
+                      max_hits: int = 0) -> Tuple[List[Tuple], Optional[str]]:
+        """単一PDF内の検索実行 (kw_lowers は小文字化済みのキーワード群。いずれかに一致すればヒット)
+
+        max_hits が1以上なら、その件数に達した時点で残りのページを読まずに打ち切る。
+        戻り値は (ヒット一覧, エラーメッセージ)。ヒットは RESULT_COLUMNS 順のタプル。
+        """
         results = []
+        file_name = os.path.basename(file_path)
+        # 日本語や数字のみのキーワードは大文字小文字の区別がないため、ページ側の小文字化を省略できる
+        case_free = all(kw == kw.upper() for kw in kw_lowers)
         try:
-            reader = PdfReader(file_path)
-            # 暗号化されている場合の簡易チェック
-            if reader.is_encrypted:
-                try:
-                    reader.decrypt("")
-                except:
-                    return [{"error": "Encrypted/Password Protected"}]
+            st = os.stat(file_path)
+            doc = None
+            extracted = []
+            pages = load_text_cache(file_path, st)
+            if pages is None:
+                doc = fitz.open(file_path)
+                # 暗号化されている場合は空パスワードで解除を試みる
+                if doc.needs_pass and not doc.authenticate(""):
+                    doc.close()
+                    return [], "Encrypted/Password Protected"
+                pages = self._extract_page_texts(doc, file_path, extracted)
+
+            for i, text in enumerate(pages):
+                if not text:
+                    continue
+                # 改行を削除して検索しやすくする (改行を含まないページではコピーを作らない)
+                clean_text = text.replace('\n', '') if '\n' in text else text
+                
+                # 大文字小文字を区別しない検索 (両辺を小文字化して単純な部分文字列検索)
+                low = clean_text if case_free else clean_text.lower()
+                for match_idx, klen in self._find_matches(low, kw_lowers):
+                    start = max(0, match_idx - 10)
+                    end = min(len(clean_text), match_idx + klen + context_len)
+                    snippet = clean_text[start:end]
+                    
+                    results.append((file_name, i + 1, "..." + snippet + "...", file_path))
+                    if max_hits and len(results) >= max_hits:
+                        break
+                if max_hits and len(results) >= max_hits:
+                    # 上限に達したら残りのページは抽出しない
+                    break
 
-            num_pages = len(reader.pages)
-            
-            for i, page in enumerate(reader.pages):
-                try:
-                    text = page.extract_text()
-                    if text:
-                        # 改行を削除して検索しやすくする
-                        clean_text = text.replace('\n', '')
-                        
-                        # 大文字小文字を区別しない検索
-                        matches = [m.start() for m in re.finditer(re.escape(keyword), clean_text, re.IGNORECASE)]
-                        
-                        for match_idx in matches:
-                            start = max(0, match_idx - 10)
-                            end = min(len(clean_text), match_idx + len(keyword) + context_len)
-                            snippet = clean_text[start:end]
-                            
-                            results.append({
-                                "file_name": os.path.basename(file_path),
-                                "file_path": file_path,
-                                "page": i + 1,
-                                "context": "..." + snippet + "...",
-                                "error": None
-                            })
-                            # 1ページに複数ヒットしても、とりあえず1つ見つかればそのページはヒットとする場合はここでbreak
-                except Exception as e:
-                    # ページ読み込みエラーはログに残すが処理は継続
-                    pass
+            if doc is not None:
+                # 全ページを読めた場合のみキャッシュする (打ち切り時や一時的なエラーは保存しない)
+                if len(extracted) == doc.page_count and None not in extracted:
+                    save_text_cache(file_path, st, extracted)
+                doc.close()
                     
         except Exception as e:
-            return [{"error": str(e)}]
+            return [], str(e)
             
-        return results
+        return results, None
 
 # =============================================================================
 # 4. GUIクラス 作成とイベント処理
@@ -139,6 +362,8 @@ class PDFSearchApp(tk.Tk):
         # GUI変数の初期化
         self.var_folder_path = tk.StringVar()
         self.var_keyword = tk.StringVar()
+        self.var_max_hits = tk.StringVar(value=ConfigManager.DEFAULT_CONFIG['Settings']['max_hits_per_file'])
+        self.var_multi_keyword = tk.BooleanVar(value=False)
         self.var_status = tk.StringVar(value="準備完了")
         self.var_progress = tk.DoubleVar(value=0)
         
@@ -166,10 +391,15 @@ class PDFSearchApp(tk.Tk):
         # キーワード
         ttk.Label(input_frame, text="検索キーワード:").grid(row=1, column=0, sticky="w", pady=5)
         ttk.Entry(input_frame, textvariable=self.var_keyword, width=60).grid(row=1, column=1, padx=5, sticky="ew", pady=5)
+        ttk.Checkbutton(input_frame, text="カンマ区切りで複数語", variable=self.var_multi_keyword).grid(row=1, column=2, sticky="w")
+        
+        # 1ファイルあたりの最大ヒット数
+        ttk.Label(input_frame, text="最大ヒット数/ファイル (0=無制限):").grid(row=2, column=0, sticky="w", pady=5)
+        ttk.Spinbox(input_frame, from_=0, to=9999, textvariable=self.var_max_hits, width=8).grid(row=2, column=1, padx=5, sticky="w", pady=5)
         
         # 設定ボタン群
         settings_btn_frame = ttk.Frame(input_frame)
-        settings_btn_frame.grid(row=2, column=1, sticky="e", pady=5)
+        settings_btn_frame.grid(row=3, column=1, sticky="e", pady=5)
         ttk.Button(settings_btn_frame, text="設定読込", command=self._load_settings_to_gui).pack(side=tk.LEFT, padx=2)
         ttk.Button(settings_btn_frame, text="設定保存", command=self._save_current_settings).pack(side=tk.LEFT, padx=2)
 
@@ -234,12 +464,16 @@ class PDFSearchApp(tk.Tk):
         settings = self.config_manager.load_config()
         self.var_folder_path.set(settings.get('target_folder', ''))
         self.var_keyword.set(settings.get('search_keyword', ''))
+        self.var_max_hits.set(settings.get('max_hits_per_file', ConfigManager.DEFAULT_CONFIG['Settings']['max_hits_per_file']))
+        self.var_multi_keyword.set(settings.get('multi_keyword', '0') == '1')
         messagebox.showinfo("設定", "設定ファイルを読み込みました。")
 
     def _save_current_settings(self):
         settings = {
             'target_folder': self.var_folder_path.get(),
-            'search_keyword': self.var_keyword.get()
+            'search_keyword': self.var_keyword.get(),
+            'max_hits_per_file': self.var_max_hits.get(),
+            'multi_keyword': '1' if self.var_multi_keyword.get() else '0'
         }
         try:
             self.config_manager.save_config(settings)
@@ -258,6 +492,13 @@ class PDFSearchApp(tk.Tk):
         if not keyword:
             messagebox.showwarning("入力エラー", "検索キーワードを入力してください。")
             return
+        try:
+            max_hits = int(self.var_max_hits.get())
+            if max_hits < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showwarning("入力エラー", "最大ヒット数には0以上の整数を入力してください。")
+            return
 
         # UI状態更新
         self._toggle_ui_state(processing=True)
@@ -269,13 +510,15 @@ class PDFSearchApp(tk.Tk):
         self.results_df = pd.DataFrame()
 
         # スレッド起動
-        thread = threading.Thread(target=self._process_search, args=(folder, keyword))
+        thread = threading.Thread(target=self._process_search,
+                                  args=(folder, keyword, max_hits, self.var_multi_keyword.get()))
         thread.daemon = True
         thread.start()
 
-    def _process_search(self, folder: str, keyword: str):
+    def _process_search(self, folder: str, keyword: str, max_hits: int = 0, multi: bool = False):
         try:
             self.var_status.set("ファイルリストを取得中...")
+            prune_text_cache()
             pdf_files = self.logic.get_pdf_files(folder)
             total_files = len(pdf_files)
             
@@ -285,39 +528,39 @@ class PDFSearchApp(tk.Tk):
                 return
 
             all_results = []
-            
+            # キーワードの分割・小文字化はファイルループの外で一度だけ行う
+            kw_lowers = parse_keywords(keyword, multi)
+
             for idx, file_path in enumerate(pdf_files):
                 # キャンセルチェック
                 if self.logic.cancel_flag:
                     self.var_status.set("検索を中断しました。")
                     break
                 
-                # 進捗更新
-                progress = (idx / total_files) * 100
-                self.var_progress.set(progress)
-                self.var_status.set(f"検索中 ({idx+1}/{total_files}): {os.path.basename(file_path)}")
+                # 進捗更新 (GUIイベントを詰まらせないよう数ファイルごとに間引く)
+                if idx % 16 == 0:
+                    progress = (idx / total_files) * 100
+                    self.var_progress.set(progress)
+                    self.var_status.set(f"検索中 ({idx+1}/{total_files}): {os.path.basename(file_path)}")
                 
                 # 検索処理
-                file_results = self.logic.search_in_pdf(file_path, keyword)
+                hits, error = self.logic.search_in_pdf(file_path, kw_lowers, max_hits=max_hits)
                 
                 # 結果処理
-                for res in file_results:
-                    if "error" in res and res["error"]:
-                        # エラーログ（コンソール出力またはログリストへの追加）
-                        print(f"Skipped {file_path}: {res['error']}")
-                        continue
-                    
-                    all_results.append(res)
-                    # Treeviewへの追加（メインスレッドで実行）
-                    self.after(0, self._add_result_to_tree, res)
+                if error:
+                    # エラーログ（コンソール出力またはログリストへの追加）
+                    print(f"Skipped {file_path}: {error}")
+                    continue
 
-                # CPU負荷を考慮し少しウェイト（必要に応じて）
-                time.sleep(0.01)
+                all_results.extend(hits)
+                # Treeviewへの追加はまとめて行う (ヒットごとにGUIイベントを発行しない)
+                for i in range(0, len(hits), 100):
+                    self.after(0, self._add_results_batch, hits[i:i + 100])
 
             self.var_progress.set(100)
             
             # DataFrameへ変換して保持
-            self.results_df = pd.DataFrame(all_results)
+            self.results_df = pd.DataFrame(all_results, columns=RESULT_COLUMNS)
             
             msg = "検索が完了しました。" if not self.logic.cancel_flag else "検索が中断されました。"
             self.var_status.set(msg)
@@ -328,15 +571,11 @@ class PDFSearchApp(tk.Tk):
         finally:
             self.after(0, lambda: self._toggle_ui_state(processing=False))
 
-    def _add_result_to_tree(self, result: Dict):
-        """検索結果をTreeviewに追加"""
-        values = (
-            result['file_name'],
-            result['page'],
-            result['context'],
-            result['file_path']
-        )
-        self.tree.insert("", "end", values=values)
+    def _add_results_batch(self, results: List[Tuple]):
+        """検索結果をまとめてTreeviewに追加 (タプルの列順はTreeviewと同じ)"""
+        insert = self.tree.insert
+        for values in results:
+            insert("", "end", values=values)
 
     def _cancel_search(self):
         if messagebox.askyesno("確認", "検索を中断しますか？"):
@@ -380,21 +619,38 @@ class PDFSearchApp(tk.Tk):
         if self.results_df.empty:
             return
             
+        # 件数が非常に多い場合はExcel形式自体がボトルネックになるためCSVを既定にする
+        filetypes = [("Excel Files", "*.xlsx"), ("CSV Files", "*.csv")]
+        if len(self.results_df) > 100000:
+            filetypes.reverse()
         file_path = filedialog.asksaveasfilename(
-            defaultextension=".xlsx",
-            filetypes=[("Excel Files", "*.xlsx")],
+            defaultextension=filetypes[0][1][1:],
+            filetypes=filetypes,
             title="検索結果を保存"
         )
         
         if file_path:
             try:
                 # Excel出力用に列を整理
-                output_df = self.results_df[["file_name", "page", "context", "file_path"]]
-                output_df.to_excel(file_path, index=False, engine='openpyxl')
+                output_df = self.results_df[RESULT_COLUMNS]
+                if file_path.lower().endswith('.csv'):
+                    output_df.to_csv(file_path, index=False, encoding='utf-8-sig')
+                else:
+                    self._write_excel(file_path, output_df)
                 messagebox.showinfo("保存完了", f"ログを保存しました:\n{file_path}")
             except Exception as e:
                 messagebox.showerror("保存エラー", f"保存に失敗しました: {e}")
 
+    @staticmethod
+    def _write_excel(file_path: str, df: pd.DataFrame):
+        """write_onlyモードのopenpyxlで行を逐次書き出す (セルオブジェクトをメモリに保持しない)"""
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Sheet1")
+        ws.append(list(df.columns))
+        for row in df.itertuples(index=False, name=None):
+            ws.append(row)
+        wb.save(file_path)
+
 # =============================================================================
 # 5. if __name__ == "__main__": でGUIを起動
 # =============================================================================
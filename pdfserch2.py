@@ -2,16 +2,58 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import configparser
 import os
-import re
+import functools
+import gzip
+import hashlib
+import json
+import logging
+import sys
 import time
 import threading
 import webbrowser
 import concurrent.futures  # 並列処理用
-from typing import List, Dict, Any
+import itertools
+import multiprocessing
+from typing import List, Dict, Tuple, Iterator, Optional, Any
 
 # 外部ライブラリ
 import pandas as pd
-from pypdf import PdfReader
+from openpyxl import Workbook
+import fitz  # PyMuPDF
+
+# 任意依存 (複数キーワードの一括検索用)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+logger = logging.getLogger(__name__)
+
+# 検索結果の列順 (ヒットはこの順のタプルで受け渡し、Treeviewにもそのまま渡す)
+RESULT_COLUMNS = ["file_name", "page", "context", "file_path"]
+# 1ファイルをページ範囲に分割する際の最小ページ数 (これより細かくするとopen/closeのコストが勝る)
+MIN_PAGES_PER_TASK = 32
+
+
+@functools.lru_cache(maxsize=8)
+def _build_automaton(kw_lowers: Tuple[str, ...]):
+    """Aho-Corasickオートマトンを構築 (ワーカープロセスごとに一度だけ)"""
+    automaton = ahocorasick.Automaton()
+    for kw in kw_lowers:
+        automaton.add_word(kw, kw)
+    automaton.make_automaton()
+    return automaton
+
+
+def parse_keywords(keyword: str, multi: bool = False) -> Tuple[str, ...]:
+    """キーワードを小文字化したタプルにする
+
+    multi=True のときだけカンマ区切りで複数語に分けて重複を除く ("1,000円" などを分割しないため既定は1語)
+    """
+    if not multi:
+        return (keyword.lower(),)
+    kws = (k.strip().lower() for k in keyword.split(','))
+    return tuple(dict.fromkeys(k for k in kws if k)) or (keyword.lower(),)
 
 # =============================================================================
 # 2. ini設定の読み書き関数 / クラス
@@ -21,30 +63,123 @@ class ConfigManager:
         'Settings': {
             'target_folder': '',
             'search_keyword': '',
-            'context_length': '30'
+            'context_length': '30',
+            'max_hits_per_file': '5',  # 1ファイルあたりの最大ヒット数 (0で無制限)
+            'multi_keyword': '0'  # 1ならキーワードをカンマ区切りで複数語として扱う
         }
     }
     
-    def __init__(self, filename: str = 'config.ini'):
+    def __init__(self, filename: str = 'config.json', legacy_filename: str = 'config.ini'):
         self.filename = filename
-        self.config = configparser.ConfigParser()
+        self.legacy_filename = legacy_filename
+        self._cached_settings: Optional[Tuple[float, Dict[str, Any]]] = None  # (mtime, 設定)
 
     def load_config(self) -> Dict[str, Any]:
+        if not os.path.exists(self.filename):
+            # 旧形式(ini)からの移行
+            self._migrate_legacy_config()
         if not os.path.exists(self.filename):
             return self.DEFAULT_CONFIG['Settings'].copy()
         try:
-            self.config.read(self.filename, encoding='utf-8')
-            if 'Settings' in self.config:
-                return dict(self.config['Settings'])
+            # ファイルが更新されていなければ再パースしない
+            mtime = os.path.getmtime(self.filename)
+            if self._cached_settings is not None and self._cached_settings[0] == mtime:
+                return self._cached_settings[1].copy()
+            with open(self.filename, 'rb') as f:
+                data = json.load(f)
+            if isinstance(data, dict) and isinstance(data.get('Settings'), dict):
+                settings = data['Settings']
             else:
-                return self.DEFAULT_CONFIG['Settings'].copy()
+                settings = self.DEFAULT_CONFIG['Settings'].copy()
+            self._cached_settings = (mtime, settings)
+            return settings.copy()
         except Exception:
             return self.DEFAULT_CONFIG['Settings'].copy()
 
     def save_config(self, settings: Dict[str, str]) -> None:
-        self.config['Settings'] = settings
+        self._cached_settings = None
         with open(self.filename, 'w', encoding='utf-8') as configfile:
-            self.config.write(configfile)
+            json.dump({'Settings': settings}, configfile, ensure_ascii=False, indent=2)
+
+    def _migrate_legacy_config(self) -> None:
+        if not os.path.exists(self.legacy_filename):
+            return
+        try:
+            config = configparser.ConfigParser()
+            config.read(self.legacy_filename, encoding='utf-8')
+            if 'Settings' in config:
+                self.save_config(dict(config['Settings']))
+        except Exception:
+            pass
+
+# =============================================================================
+# 抽出テキストのディスクキャッシュ
+# =============================================================================
+# 2回目以降の検索ではPDFを解析せず、保存済みのページテキストを使う
+TEXT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".pdfserch_cache")
+# キャッシュ全体の上限。超えた分は最近使われていないものから削除する
+TEXT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+def _text_cache_path(file_path: str, st: os.stat_result, start_page: int, end_page: Optional[int]) -> str:
+    # キーは (パス, mtime, サイズ, ページ範囲)。ページ範囲ごとに保存するのでワーカー間で書き込みが衝突しない
+    key = f"{os.path.abspath(file_path)}|{st.st_mtime_ns}|{st.st_size}|{start_page}|{end_page}"
+    return os.path.join(TEXT_CACHE_DIR, hashlib.sha1(key.encode('utf-8')).hexdigest() + ".json.gz")
+
+
+def load_text_cache(file_path: str, st: os.stat_result, start_page: int = 0,
+                    end_page: Optional[int] = None) -> Optional[List[str]]:
+    cache_path = _text_cache_path(file_path, st, start_page, end_page)
+    try:
+        with gzip.open(cache_path, 'rt', encoding='utf-8') as f:
+            pages = json.load(f)
+    except (OSError, ValueError):
+        return None
+    try:
+        # 更新日時を使用日時として扱い、削除対象の判定に使う
+        os.utime(cache_path)
+    except OSError:
+        pass
+    return pages
+
+
+def save_text_cache(file_path: str, st: os.stat_result, start_page: int, end_page: Optional[int],
+                    pages: List[str]) -> None:
+    try:
+        os.makedirs(TEXT_CACHE_DIR, exist_ok=True)
+        cache_path = _text_cache_path(file_path, st, start_page, end_page)
+        # 一時ファイルに書いてから置き換え (途中で読まれても壊れたキャッシュを掴まない)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(pages, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def prune_text_cache(max_bytes: int = TEXT_CACHE_MAX_BYTES) -> None:
+    # キャッシュ全体が上限を超えていれば、最近使われていないものから削除する
+    # （PDF更新で使われなくなった古いキーのエントリもここで消える）
+    entries = []
+    try:
+        with os.scandir(TEXT_CACHE_DIR) as it:
+            for entry in it:
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+    except OSError:
+        return
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
 
 # =============================================================================
 # 3. メイン処理関数 (並列処理ロジック)
@@ -52,56 +187,168 @@ class ConfigManager:
 class SearchLogic:
     def __init__(self):
         self.cancel_flag = False
+        # フォルダごとのPDF一覧キャッシュ {folder_path: ({ディレクトリ: mtime}, PDF一覧)}
+        self._pdf_list_cache: Dict[str, Tuple[Dict[str, float], List[str]]] = {}
 
     def get_pdf_files(self, folder_path: str) -> List[str]:
-        pdf_files = []
-        for root, _, files in os.walk(folder_path):
-            for file in files:
-                if file.lower().endswith('.pdf'):
-                    pdf_files.append(os.path.join(root, file))
+        # 配下のディレクトリのmtimeがすべて前回と同じなら再走査しない
+        cached = self._pdf_list_cache.get(folder_path)
+        if cached is not None and self._dirs_unchanged(cached[0]):
+            return cached[1]
+
+        dir_mtimes = {}
+        pdf_files = list(self._iter_pdf_files(folder_path, dir_mtimes))
+        self._pdf_list_cache[folder_path] = (dir_mtimes, pdf_files)
         return pdf_files
 
-    def search_in_pdf(self, file_path: str, keyword: str, context_len: int = 30) -> List[Dict]:
-        """pypdfを使用した検索処理"""
+    @staticmethod
+    def _iter_pdf_files(folder_path: str, dir_mtimes: Dict[str, float]) -> Iterator[str]:
+        # os.scandirによる非再帰走査 (DirEntryの種別情報を使い、ファイルごとのstatを避ける)
+        stack = [folder_path]
+        while stack:
+            current = stack.pop()
+            try:
+                dir_mtimes[current] = os.stat(current).st_mtime
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name[-4:].lower() == '.pdf':
+                            yield entry.path
+            except OSError:
+                continue
+
+    @staticmethod
+    def _dirs_unchanged(dir_mtimes: Dict[str, float]) -> bool:
+        try:
+            return all(os.stat(d).st_mtime == m for d, m in dir_mtimes.items())
+        except OSError:
+            return False
+
+    @staticmethod
+    def plan_tasks(pdf_files: List[str], workers: int) -> List[Tuple[str, int, Optional[int]]]:
+        """検索タスク (ファイル, 開始ページ, 終了ページ) の一覧を作る
+
+        ファイル数がワーカー数以上ならファイル単位。少ない場合は大きなPDFをページ範囲に分割し、
+        巨大なPDFが1つだけでも全コアを使えるようにする
+        """
+        if len(pdf_files) >= workers:
+            return [(p, 0, None) for p in pdf_files]
+
+        tasks = []
+        for p in pdf_files:
+            try:
+                with fitz.open(p) as doc:
+                    page_count = doc.page_count
+            except Exception:
+                page_count = 0
+            chunk = max(MIN_PAGES_PER_TASK, -(-page_count // workers))
+            if page_count <= chunk:
+                tasks.append((p, 0, None))
+            else:
+                tasks.extend((p, s, min(s + chunk, page_count)) for s in range(0, page_count, chunk))
+        return tasks
+
+    @staticmethod
+    def _find_matches(low: str, kw_lowers: Tuple[str, ...]) -> List[Tuple[int, int]]:
+        """小文字化済みの本文から (開始位置, 長さ) の一覧を返す"""
+        if len(kw_lowers) > 1 and ahocorasick is not None:
+            # 全キーワードを1回の走査でまとめて検出
+            return [(end_idx - len(kw) + 1, len(kw)) for end_idx, kw in _build_automaton(kw_lowers).iter(low)]
+
+        matches = []
+        for kw in kw_lowers:
+            # C実装の包含判定で先にふるい落とし、ヒットしないページは位置収集を行わない
+            if kw not in low:
+                continue
+            klen = len(kw)
+            pos = 0
+            while True:
+                idx = low.find(kw, pos)
+                if idx < 0:
+                    break
+                matches.append((idx, klen))
+                pos = idx + klen
+        if len(kw_lowers) > 1:
+            matches.sort()
+        return matches
+
+    @staticmethod
+    def search_in_pdf(file_path: str, kw_lowers: Tuple[str, ...], context_len: int = 30,
+                      start_page: int = 0, end_page: Optional[int] = None,
+                      max_hits: int = 0) -> Tuple[List[Tuple], Optional[str]]:
+        """PyMuPDF(fitz)を使用した検索処理 (kw_lowers は小文字化済みのキーワード群)
+
+        別プロセスで実行されるため self を参照しない (pickle可能な引数のみ受け取る)
+        start_page/end_page を指定するとその範囲 (0始まり、end_pageは含まない) のページだけを検索する
+        max_hits が1以上なら、その件数に達した時点で残りのページを読まずに打ち切る (ページ範囲単位。
+        ファイル全体の上限は呼び出し側で全範囲の結果をまとめてから適用する)
+        戻り値は (RESULT_COLUMNS 順のタプルのリスト, エラーメッセージ)
+        """
         results = []
+        file_name = os.path.basename(file_path)
+        # 大文字小文字を持たないキーワード (日本語・数字など) ならページの小文字化は不要
+        case_free = all(kw == kw.upper() for kw in kw_lowers)
         try:
-            if self.cancel_flag: return []
+            st = os.stat(file_path)
+            doc = None
+            pages = load_text_cache(file_path, st, start_page, end_page)
+            if pages is None:
+                doc = fitz.open(file_path)
+                # 暗号化ファイル対応
+                if doc.needs_pass and not doc.authenticate(""):
+                    doc.close()
+                    return [], "Password Protected"
+                stop = doc.page_count if end_page is None else min(end_page, doc.page_count)
+                pages = []
+                complete = True
 
-            reader = PdfReader(file_path)
-            # 暗号化ファイル対応
-            if reader.is_encrypted:
-                try:
-                    reader.decrypt("")
-                except:
-                    return [{"error": "Password Protected"}]
+            i = start_page - 1
+            while True:
+                i += 1
+                if doc is None:
+                    # キャッシュ済みテキストを順に参照
+                    if i - start_page >= len(pages):
+                        break
+                    text = pages[i - start_page]
+                else:
+                    # 上限到達で打ち切れるよう、ページは必要になった時点で1枚ずつ抽出する
+                    if i >= stop:
+                        break
+                    try:
+                        text = doc.load_page(i).get_text("text")
+                    except Exception:
+                        # 壊れたページは空として扱い、原因はデバッグログで追えるようにする
+                        logger.debug("Page text extraction failed: %s (page %d)", file_path, i + 1, exc_info=True)
+                        text = ""
+                        complete = False
+                    pages.append(text)
+                if not text:
+                    continue
+                # 改行を含まないページでは全文コピーを作らない
+                clean_text = text.replace('\n', '') if '\n' in text else text
+                # 両辺を小文字化して単純な部分文字列検索 (re.IGNORECASEより高速)
+                low = clean_text if case_free else clean_text.lower()
+                for match_idx, klen in SearchLogic._find_matches(low, kw_lowers):
+                    start = max(0, match_idx - 10)
+                    end = min(len(clean_text), match_idx + klen + context_len)
+                    snippet = clean_text[start:end]
+                    
+                    results.append((file_name, i + 1, "..." + snippet + "...", file_path))
+                    if max_hits and len(results) >= max_hits:
+                        break
+                if max_hits and len(results) >= max_hits:
+                    break
 
-            for i, page in enumerate(reader.pages):
-                if self.cancel_flag: break
-                try:
-                    text = page.extract_text()
-                    if text:
-                        clean_text = text.replace('\n', '')
-                        matches = [m.start() for m in re.finditer(re.escape(keyword), clean_text, re.IGNORECASE)]
-                        
-                        for match_idx in matches:
-                            start = max(0, match_idx - 10)
-                            end = min(len(clean_text), match_idx + len(keyword) + context_len)
-                            snippet = clean_text[start:end]
-                            
-                            results.append({
-                                "file_name": os.path.basename(file_path),
-                                "file_path": file_path,
-                                "page": i + 1,
-                                "context": "..." + snippet + "...",
-                                "error": None
-                            })
-                            # 1ページに複数ヒットしても良いが、高速化のためbreakを入れても良い
-                except:
-                    pass
+            if doc is not None:
+                # 途中で打ち切った場合はページが欠けるためキャッシュしない
+                if complete and len(pages) == stop - start_page:
+                    save_text_cache(file_path, st, start_page, end_page, pages)
+                doc.close()
         except Exception as e:
-            return [{"error": str(e)}]
+            return [], str(e)
             
-        return results
+        return results, None
 
 # =============================================================================
 # 4. GUIクラス
@@ -115,9 +362,12 @@ class PDFSearchApp(tk.Tk):
         self.config_manager = ConfigManager()
         self.logic = SearchLogic()
         self.results_df = pd.DataFrame()
+        self._all_results = []  # 検索スレッドで蓄積するヒット一覧 (Treeviewは表示専用)
         
         self.var_folder_path = tk.StringVar()
         self.var_keyword = tk.StringVar()
+        self.var_max_hits = tk.StringVar(value=ConfigManager.DEFAULT_CONFIG['Settings']['max_hits_per_file'])
+        self.var_multi_keyword = tk.BooleanVar(value=False)
         self.var_status = tk.StringVar(value="準備完了")
         self.var_progress = tk.DoubleVar(value=0)
         
@@ -138,9 +388,13 @@ class PDFSearchApp(tk.Tk):
         
         ttk.Label(input_frame, text="キーワード:").grid(row=1, column=0, sticky="w", pady=5)
         ttk.Entry(input_frame, textvariable=self.var_keyword).grid(row=1, column=1, sticky="ew", padx=5, pady=5)
+        ttk.Checkbutton(input_frame, text="カンマ区切りで複数語", variable=self.var_multi_keyword).grid(row=1, column=2, sticky="w")
+        
+        ttk.Label(input_frame, text="最大ヒット数/ファイル (0=無制限):").grid(row=2, column=0, sticky="w", pady=5)
+        ttk.Spinbox(input_frame, from_=0, to=9999, textvariable=self.var_max_hits, width=8).grid(row=2, column=1, sticky="w", padx=5, pady=5)
         
         btn_frame = ttk.Frame(input_frame)
-        btn_frame.grid(row=2, column=1, sticky="e")
+        btn_frame.grid(row=3, column=1, sticky="e")
         ttk.Button(btn_frame, text="設定読込", command=self._load_settings_to_gui).pack(side=tk.LEFT, padx=2)
         ttk.Button(btn_frame, text="設定保存", command=self._save_current_settings).pack(side=tk.LEFT, padx=2)
         
@@ -187,11 +441,15 @@ class PDFSearchApp(tk.Tk):
         s = self.config_manager.load_config()
         self.var_folder_path.set(s.get('target_folder', ''))
         self.var_keyword.set(s.get('search_keyword', ''))
+        self.var_max_hits.set(s.get('max_hits_per_file', ConfigManager.DEFAULT_CONFIG['Settings']['max_hits_per_file']))
+        self.var_multi_keyword.set(s.get('multi_keyword', '0') == '1')
 
     def _save_current_settings(self):
         self.config_manager.save_config({
             'target_folder': self.var_folder_path.get(),
-            'search_keyword': self.var_keyword.get()
+            'search_keyword': self.var_keyword.get(),
+            'max_hits_per_file': self.var_max_hits.get(),
+            'multi_keyword': '1' if self.var_multi_keyword.get() else '0'
         })
         messagebox.showinfo("設定", "保存しました。")
 
@@ -201,17 +459,28 @@ class PDFSearchApp(tk.Tk):
         if not folder or not keyword:
             messagebox.showwarning("エラー", "フォルダとキーワードを入力してください。")
             return
+        try:
+            max_hits = int(self.var_max_hits.get())
+            if max_hits < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showwarning("エラー", "最大ヒット数には0以上の整数を入力してください。")
+            return
             
         self._toggle_ui_state(True)
         self.logic.cancel_flag = False
         for item in self.tree.get_children():
             self.tree.delete(item)
+        self._all_results = []
+        self.results_df = pd.DataFrame()
             
-        threading.Thread(target=self._process_search, args=(folder, keyword), daemon=True).start()
+        threading.Thread(target=self._process_search,
+                         args=(folder, keyword, max_hits, self.var_multi_keyword.get()), daemon=True).start()
 
-    def _process_search(self, folder, keyword):
+    def _process_search(self, folder, keyword, max_hits=0, multi=False):
         try:
             self.var_status.set("ファイルリスト取得中...")
+            prune_text_cache()
             pdf_files = self.logic.get_pdf_files(folder)
             total = len(pdf_files)
             
@@ -222,28 +491,73 @@ class PDFSearchApp(tk.Tk):
 
             self.var_status.set(f"検索開始: {total}件...")
             processed_count = 0
-            
-            # 並列処理 (ネットワーク負荷を考慮し同時実行数は5程度に制限)
-            with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                future_to_file = {executor.submit(self.logic.search_in_pdf, p, keyword): p for p in pdf_files}
-                
-                for future in concurrent.futures.as_completed(future_to_file):
-                    if self.logic.cancel_flag: break
-                    
-                    try:
-                        results = future.result()
-                        for res in results:
-                            if not res.get("error"):
-                                self.after(0, self._add_result, res)
-                    except Exception:
-                        pass
-                    
-                    processed_count += 1
+            kw_lowers = parse_keywords(keyword, multi)
+
+            # 並列処理 (PDF解析はGILを握るCPU処理で、PyMuPDFはスレッド非対応のためプロセス並列)
+            max_workers = os.cpu_count() or 4
+            if sys.platform == "win32":
+                # WindowsのProcessPoolExecutorは61プロセスまで (超えるとValueError)
+                max_workers = min(61, max_workers)
+            tasks = self.logic.plan_tasks(pdf_files, max_workers)
+            total = len(tasks)
+            # ページ範囲に分割したファイルは全範囲の完了を待ち、ページ順に並べてから最大ヒット数で切り詰める
+            remaining_tasks = {}
+            for p, _start, _end in tasks:
+                remaining_tasks[p] = remaining_tasks.get(p, 0) + 1
+            file_hits = {}
+            pool_kwargs = {"max_workers": max_workers}
+            if sys.version_info >= (3, 11):
+                # 大量ファイル処理時にワーカーのメモリが膨らまないよう定期的に入れ替える
+                pool_kwargs["max_tasks_per_child"] = 200
+            # 未完了タスク数の上限 (全件を一度に投入せず、ファイル数によらずメモリ使用量を一定に保つ)
+            max_pending = max_workers * 4
+            with concurrent.futures.ProcessPoolExecutor(**pool_kwargs) as executor:
+                tasks_iter = iter(tasks)
+                pending = set()
+                future_files = {}
+                while True:
+                    # ウィンドウに空きがある分だけ次のタスクを投入
+                    for p, start_page, end_page in itertools.islice(tasks_iter, max_pending - len(pending)):
+                        future = executor.submit(SearchLogic.search_in_pdf, p, kw_lowers,
+                                                 start_page=start_page, end_page=end_page,
+                                                 max_hits=max_hits)
+                        future_files[future] = p
+                        pending.add(future)
+                    if not pending:
+                        break
+
+                    done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    if self.logic.cancel_flag:
+                        # 未着手のタスクは破棄し、実行中のものだけ完了を待つ
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        break
+
+                    for future in done:
+                        p = future_files.pop(future)
+                        try:
+                            hits, _error = future.result()
+                            if hits:
+                                file_hits.setdefault(p, []).extend(hits)
+                        except Exception:
+                            pass
+
+                        remaining_tasks[p] -= 1
+                        if remaining_tasks[p] == 0:
+                            hits = file_hits.pop(p, [])
+                            if hits:
+                                hits.sort(key=lambda h: h[1])
+                                if max_hits:
+                                    hits = hits[:max_hits]
+                                self._all_results.extend(hits)
+                                # ファイル単位でまとめてTreeviewへ反映
+                                self.after(0, self._add_results_batch, hits)
+
+                        processed_count += 1
                     self.var_progress.set((processed_count / total) * 100)
                     self.var_status.set(f"検索中 ({processed_count}/{total})")
 
             # 結果データの保存用DataFrame作成
-            self._update_results_df_from_tree()
+            self.results_df = pd.DataFrame(self._all_results, columns=RESULT_COLUMNS)
 
             msg = "検索完了" if not self.logic.cancel_flag else "中断されました"
             self.after(0, lambda: messagebox.showinfo("完了", msg))
@@ -253,16 +567,10 @@ class PDFSearchApp(tk.Tk):
         finally:
             self.after(0, lambda: self._toggle_ui_state(False))
 
-    def _add_result(self, res):
-        self.tree.insert("", "end", values=(res['file_name'], res['page'], res['context'], res['file_path']))
-
-    def _update_results_df_from_tree(self):
-        # GUIスレッドで実行する必要があるためafterで呼ぶか、完了後に実行
-        rows = []
-        for child in self.tree.get_children():
-            val = self.tree.item(child)['values']
-            rows.append({"file_name": val[0], "page": val[1], "context": val[2], "file_path": val[3]})
-        self.results_df = pd.DataFrame(rows)
+    def _add_results_batch(self, results):
+        insert = self.tree.insert
+        for values in results:
+            insert("", "end", values=values)
 
     def _toggle_ui_state(self, processing):
         self.btn_run.config(state=tk.DISABLED if processing else tk.NORMAL)
@@ -287,16 +595,29 @@ class PDFSearchApp(tk.Tk):
 
     def _save_log(self):
         if self.results_df.empty: return
-        f = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel", "*.xlsx")])
+        # 大量件数ではExcel形式が遅いのでCSVを既定にする
+        filetypes = [("Excel", "*.xlsx"), ("CSV", "*.csv")]
+        if len(self.results_df) > 100000:
+            filetypes.reverse()
+        f = filedialog.asksaveasfilename(defaultextension=filetypes[0][1][1:], filetypes=filetypes)
         if f:
             try:
-                # Treeviewからの再取得が必要な場合があるため念のため更新
-                self._update_results_df_from_tree()
-                self.results_df.to_excel(f, index=False)
+                if f.lower().endswith('.csv'):
+                    self.results_df.to_csv(f, index=False, encoding='utf-8-sig')
+                else:
+                    # write_onlyモードで行を逐次書き出す
+                    wb = Workbook(write_only=True)
+                    ws = wb.create_sheet("Sheet1")
+                    ws.append(list(self.results_df.columns))
+                    for row in self.results_df.itertuples(index=False, name=None):
+                        ws.append(row)
+                    wb.save(f)
                 messagebox.showinfo("保存", "保存しました。")
             except Exception as e:
                 messagebox.showerror("エラー", str(e))
 
 if __name__ == "__main__":
+    # PyInstallerでexe化した場合にワーカープロセスが再度GUIを起動しないようにする
+    multiprocessing.freeze_support()
     app = PDFSearchApp()
     app.mainloop()
\ No newline at end of file
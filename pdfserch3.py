@@ -13,6 +13,9 @@ from typing import List, Dict, Any
 import pandas as pd
 import fitz  # PyMuPDF (高速PDFエンジン)
 
+# 正規表現として特別な意味を持つ文字 (含まなければキーワードをそのままパターンに使える)
+_RE_SPECIAL_CHARS = re.compile(r'[.^$*+?{}\[\]\\|()]')
+
 # =============================================================================
 # 2. ini設定の読み書き
 # =============================================================================
@@ -58,8 +61,8 @@ class SearchLogic:
                     pdf_files.append(os.path.join(root, file))
         return pdf_files
 
-    def search_in_pdf(self, file_path: str, keyword: str, context_len: int = 30) -> List[Dict]:
-        """PyMuPDF(fitz)を使用した高速検索"""
+    def search_in_pdf(self, file_path: str, pattern: re.Pattern, context_len: int = 30) -> List[Dict]:
+        """PyMuPDF(fitz)を使用した高速検索 (pattern は検索開始時に一度だけコンパイル済み)"""
         results = []
         try:
             if self.cancel_flag: return []
@@ -74,11 +77,11 @@ class SearchLogic:
                 text = page.get_text()
                 if text:
                     clean_text = text.replace('\n', '')
-                    matches = [m.start() for m in re.finditer(re.escape(keyword), clean_text, re.IGNORECASE)]
+                    matches = [(m.start(), m.end()) for m in pattern.finditer(clean_text)]
                     
-                    for match_idx in matches:
+                    for match_idx, match_end in matches:
                         start = max(0, match_idx - 10)
-                        end = min(len(clean_text), match_idx + len(keyword) + context_len)
+                        end = min(len(clean_text), match_end + context_len)
                         snippet = clean_text[start:end]
                         
                         results.append({
@@ -212,10 +215,13 @@ class PDFSearchApp(tk.Tk):
 
             self.var_status.set(f"高速検索開始: {total}件...")
             processed_count = 0
+            # パターンはページごとではなく検索ごとに一度だけコンパイル
+            needs_escape = bool(_RE_SPECIAL_CHARS.search(keyword))
+            pattern = re.compile(re.escape(keyword) if needs_escape else keyword, re.IGNORECASE)
             
             # 並列処理 (PyMuPDFはCPUも使うため、ワーカー数はCPUコア数依存が良いが、ここではバランス型で5)
             with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                future_to_file = {executor.submit(self.logic.search_in_pdf, p, keyword): p for p in pdf_files}
+                future_to_file = {executor.submit(self.logic.search_in_pdf, p, pattern): p for p in pdf_files}
                 
                 for future in concurrent.futures.as_completed(future_to_file):
                     if self.logic.cancel_flag: break
@@ -2,6 +2,9 @@ import os
 import re
 import sys
 import zlib
+import gzip
+import json
+import hashlib
 import time
 import queue
 import mmap
@@ -10,6 +13,7 @@ import webbrowser
 import traceback
 import configparser
 import threading
+import multiprocessing
 import concurrent.futures
 from pathlib import Path
 from datetime import datetime
@@ -19,6 +23,12 @@ from tkinter import ttk, messagebox, filedialog
 
 from openpyxl import Workbook
 
+try:
+    # 複数語検索の高速化用（未インストールなら正規表現の選択で代用）
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 
 # ========== 2. ini設定の読み書き関数 ==========
 def load_ini(ini_path: str) -> dict:
@@ -30,6 +40,7 @@ def load_ini(ini_path: str) -> dict:
         "recursive": True,
         "case_sensitive": False,
         "use_regex": False,
+        "multi_terms": False,
     }
     if os.path.exists(ini_path):
         try:
@@ -41,6 +52,7 @@ def load_ini(ini_path: str) -> dict:
             settings["recursive"] = s.getboolean("recursive", True)
             settings["case_sensitive"] = s.getboolean("case_sensitive", False)
             settings["use_regex"] = s.getboolean("use_regex", False)
+            settings["multi_terms"] = s.getboolean("multi_terms", False)
         except Exception:
             pass
     return settings
@@ -55,6 +67,7 @@ def save_ini(ini_path: str, settings: dict) -> None:
         "recursive": str(settings.get("recursive", True)),
         "case_sensitive": str(settings.get("case_sensitive", False)),
         "use_regex": str(settings.get("use_regex", False)),
+        "multi_terms": str(settings.get("multi_terms", False)),
     }
     with open(ini_path, "w", encoding="utf-8") as f:
         config.write(f)
@@ -63,167 +76,354 @@ def save_ini(ini_path: str, settings: dict) -> None:
 # ========== PDFテキスト抽出（純Python最適化版） ==========
 # 事前コンパイル済みパターンで速度を稼ぐ
 _RE_OBJ = re.compile(rb"\b(\d+)\s+0\s+obj\b")
-_RE_IS_PAGE = re.compile(rb"/Type\s*/Page\b")
-_RE_CONTENTS_SINGLE = re.compile(rb"/Contents\s+(\d+)\s+0\s+R")
-_RE_CONTENTS_ARRAY = re.compile(rb"/Contents\s*\[(.*?)\]", flags=re.S)
+# ページ辞書のキーを1回の走査でまとめて拾う
+# 1: /Type /Page、2: /Contents の単一参照、3: /Contents 配列の中身
+# （配列の中身は "]" 以外の並びとして取り、遅延量指定子+DOTALLのような1文字ずつの終端判定をしない）
+_RE_PAGE_KEYS = re.compile(rb"(/Type\s*/Page\b)|/Contents(?:\s+(\d+)\s+0\s+R|\s*\[([^\]]*)\])")
 _RE_INDIRECT = re.compile(rb"(\d+)\s+0\s+R")
-_RE_BT_ET = re.compile(rb"BT(.*?)ET", flags=re.S)
-_RE_PAREN_STRING = re.compile(rb"\((?:\\.|[^\\])*?\)", flags=re.S)
-
-
-def _pdf_unescape_string(b: bytes) -> str:
-    out = bytearray()
-    i = 0
-    n = len(b)
-    while i < n:
-        c = b[i]
-        if c == 92 and i + 1 < n:  # "\"
-            i += 1
-            esc = b[i]
-            if esc in (40, 41, 92):  # ( ) \
-                out.append(esc)
-                i += 1
-            elif esc == 110:  # n
-                out.append(10)
-                i += 1
-            elif esc == 114:  # r
-                out.append(13)
-                i += 1
-            elif esc == 116:  # t
-                out.append(9)
-                i += 1
-            elif esc == 98:  # b
-                out.append(8)
-                i += 1
-            elif esc == 102:  # f
-                out.append(12)
-                i += 1
-            elif 48 <= esc <= 55:  # octal up to 3 digits
-                oct_digits = [esc]
-                i += 1
-                for _ in range(2):
-                    if i < n and 48 <= b[i] <= 55:
-                        oct_digits.append(b[i])
-                        i += 1
-                    else:
-                        break
-                try:
-                    out.append(int(bytes(oct_digits), 8))
-                except Exception:
-                    pass
-            else:
-                out.append(esc)
-                i += 1
-        else:
-            out.append(c)
-            i += 1
+# 文字列内のエスケープ（8進数は最大3桁、それ以外は直後の1文字）
+_RE_ESCAPE = re.compile(rb"\\([0-7]{1,3}|.)", flags=re.S)
+# "\" の直後の1バイト → 展開後のバイト列（256要素の表。n r t b f 以外は ( ) \ を含めその文字自身）
+_ESCAPE_TABLE = bytearray(range(256))
+for _k, _v in zip(b"nrtbf", b"\n\r\t\b\f"):
+    _ESCAPE_TABLE[_k] = _v
+_ESCAPE_BYTES = tuple(bytes((_v,)) for _v in _ESCAPE_TABLE)
+# 文字列走査用の区切り。通常のバイトは正規表現エンジン側で読み飛ばす
+# 1: 入れ子もエスケープもない文字列の中身（大半の文字列は1回の一致で済む）、それ以外はエスケープ1組または括弧
+_RE_PAREN_TOKEN = re.compile(rb"\(([^()\\]*)\)|\\.|[()]", flags=re.S)
+# 画像ストリームの判定（辞書の /Subtype と画像専用フィルタ）
+_RE_IMAGE = re.compile(rb"/Subtype\s*/Image\b")
+_IMAGE_FILTERS = (b"/DCTDecode", b"/JPXDecode", b"/CCITTFaxDecode", b"/JBIG2Decode")
+# これより大きいオブジェクトはページ辞書ではない（コンテンツストリームや画像）とみなす
+_PAGE_DICT_MAX_SIZE = 64 * 1024
+
+
+def _unescape_match(m: "re.Match[bytes]") -> bytes:
+    esc = m.group(1)
+    if 48 <= esc[0] <= 55:  # octal up to 3 digits
+        v = int(esc, 8)
+        # 1バイトに収まらない値は捨てる
+        return bytes((v,)) if v < 256 else b""
+    # 表引き1回で展開（文字ごとの比較分岐なし）
+    return _ESCAPE_BYTES[esc[0]]
+
+
+def _pdf_unescape_bytes(b: bytes) -> bytes:
+    # エスケープのない文字列（大半）はそのまま返す
+    # エスケープがあれば1回の正規表現置換でまとめて展開し、1バイトずつのPythonループを避ける
+    if b"\\" in b:
+        return _RE_ESCAPE.sub(_unescape_match, b)
+    return b
+
+
+def _decode_pdf_bytes(b: bytes) -> str:
     try:
-        return out.decode("utf-8")
+        return b.decode("utf-8")
     except Exception:
-        return out.decode("latin-1", errors="ignore")
+        return b.decode("latin-1", errors="ignore")
 
 
-def _extract_streams_from_object(obj_bytes: bytes) -> t.List[bytes]:
-    streams: t.List[bytes] = []
+def _inflate(raw: bytes) -> bytes:
+    # zlibヘッダ付き → 生deflate の2パターンで伸長を試みる
+    # decompressobj は途中で切れたストリームでもそこまでの内容を返す
+    for wbits in (zlib.MAX_WBITS, -zlib.MAX_WBITS):
+        try:
+            return zlib.decompressobj(wbits).decompress(raw)
+        except zlib.error:
+            continue
+    return raw
+
+
+def _extract_stream_from_object(obj_bytes: bytes) -> t.Optional[bytes]:
+    # 1つのオブジェクトが持つストリームは最大1つなので、最初の1つだけ取り出す
+    s_idx = obj_bytes.find(b"stream")
+    if s_idx == -1:
+        return None
+    s_idx_end = s_idx + 6
+    # EOL調整
+    if s_idx_end < len(obj_bytes) and obj_bytes[s_idx_end] in (10, 13):
+        if obj_bytes[s_idx_end] == 13 and s_idx_end + 1 < len(obj_bytes) and obj_bytes[s_idx_end + 1] == 10:
+            s_idx_end += 2
+        else:
+            s_idx_end += 1
+    # 終端はオブジェクト末尾側から探す（ストリーム本体を先頭から走査しない）
+    e_idx = obj_bytes.rfind(b"endstream", s_idx_end)
+    if e_idx == -1:
+        return None
+    header = obj_bytes[:s_idx]
+    # 画像ストリームにはテキストがないため、伸長せずに読み飛ばす
+    if _RE_IMAGE.search(header) or any(f in header for f in _IMAGE_FILTERS):
+        return None
+    raw = obj_bytes[s_idx_end:e_idx]
+    if b"/FlateDecode" in header:
+        return _inflate(raw)
+    return raw
+
+
+def _iter_paren_strings(sec: bytes, pos: int = 0, endpos: t.Optional[int] = None) -> t.Iterator[t.Tuple[int, int]]:
+    # sec[pos:endpos] 内の () 文字列の内側の範囲 (開始, 終了) を返す（位置は sec 全体に対するもの）
+    # 入れ子の括弧とエスケープを考慮した1パス走査（バックトラックしないので長い括弧列でも線形）
+    depth = 0
+    start = 0
+    if endpos is None:
+        endpos = len(sec)
+    for m in _RE_PAREN_TOKEN.finditer(sec, pos, endpos):
+        if m.group(1) is not None:
+            # 単純な文字列。入れ子の内側なら釣り合った括弧として読み飛ばす
+            if depth == 0:
+                yield m.span(1)
+            continue
+        c = sec[m.start()]
+        if c == 40:  # (
+            if depth == 0:
+                start = m.end()
+            depth += 1
+        elif c == 41:  # )
+            if depth:
+                depth -= 1
+                if depth == 0:
+                    yield start, m.start()
+
+
+def _iter_text_strings(data: bytes) -> t.Iterator[t.Tuple[int, int]]:
+    # BT..ET 範囲内の () 文字列の範囲を返す
+    # インライン画像（BI..ID..EI）のバイナリに紛れた "(" で以降の文字列を取りこぼさないよう、範囲外は走査しない
+    # 範囲は切り出さず、find で境界を探して元のバッファ上を走査する
     pos = 0
     while True:
-        s_idx = obj_bytes.find(b"stream", pos)
-        if s_idx == -1:
-            break
-        s_idx_end = s_idx + 6
-        # EOL調整
-        if s_idx_end < len(obj_bytes) and obj_bytes[s_idx_end] in (10, 13):
-            if obj_bytes[s_idx_end] == 13 and s_idx_end + 1 < len(obj_bytes) and obj_bytes[s_idx_end + 1] == 10:
-                s_idx_end += 2
-            else:
-                s_idx_end += 1
-        e_idx = obj_bytes.find(b"endstream", s_idx_end)
-        if e_idx == -1:
-            break
-        raw = obj_bytes[s_idx_end:e_idx]
-        header = obj_bytes[:s_idx]
-        data = raw
-        if b"/FlateDecode" in header:
-            # 2パターンで伸長を試みる
-            try:
-                data = zlib.decompress(raw)
-            except Exception:
-                try:
-                    data = zlib.decompress(raw, -15)
-                except Exception:
-                    data = raw
-        streams.append(data)
-        pos = e_idx + 9
-    return streams
+        bt = data.find(b"BT", pos)
+        if bt == -1:
+            return
+        et = data.find(b"ET", bt + 2)
+        if et == -1:
+            return
+        yield from _iter_paren_strings(data, bt + 2, et)
+        pos = et + 2
+
+
+def _append_stream_text(data: bytes, buf: bytearray) -> None:
+    # BT..ET 内の () 文字列を抽出し、展開したバイト列を buf に直接追記する
+    for s, e in _iter_text_strings(data):
+        buf += _pdf_unescape_bytes(data[s:e])
 
 
 def _extract_text_from_content_stream(data: bytes) -> str:
-    # BT..ET 範囲から () 文字列のみ抽出
-    chunks: t.List[str] = []
-    for m in _RE_BT_ET.finditer(data):
-        sec = m.group(1)
-        for sm in _RE_PAREN_STRING.finditer(sec):
-            s = sm.group(0)
-            inner = s[1:-1]
-            chunks.append(_pdf_unescape_string(inner))
-    return "".join(chunks)
-
-
-def extract_text_per_page_fast(pdf_path: str) -> t.Dict[int, str]:
-    # メモリマップで高速にスキャン
+    # UTF-8として読めないページ用: ストリーム単位でデコードし、失敗時は文字列ごとにデコードする
+    parts = [_pdf_unescape_bytes(data[s:e]) for s, e in _iter_text_strings(data)]
+    try:
+        return b"".join(parts).decode("utf-8")
+    except UnicodeDecodeError:
+        # UTF-8として読めない文字列が混じる場合は文字列ごとにデコード（読めないものはlatin-1扱い）
+        return "".join(_decode_pdf_bytes(p) for p in parts)
+
+
+def _required_bytes(terms: t.List[str], case_sensitive: bool) -> t.List[bytes]:
+    # 検索語が含まれるページのストリームに必ず現れるバイト（大小文字を区別しない場合は両方を候補にする）
+    # TJ配列などで語が分割されても1文字ずつは必ず残るため、部分文字列ではなく文字単位で判定する
+    # latin-1フォールバックでも1対1に対応するASCII文字だけを対象にする
+    # 複数語（いずれかに一致）の場合は全ての語に共通する文字だけが必須になる
+    per_term: t.List[t.List[bytes]] = []
+    for term in terms:
+        groups: t.List[bytes] = []
+        for ch in sorted(set(term)):
+            if not ch.isascii():
+                continue
+            alts = ch if case_sensitive else ch.lower() + ch.upper()
+            alts = bytes(sorted(set(alts.encode("ascii"))))
+            if alts not in groups:
+                groups.append(alts)
+        per_term.append(groups)
+    if not per_term:
+        return []
+    return [g for g in per_term[0] if all(g in other for other in per_term[1:])]
+
+
+def _may_contain(streams: t.List[bytes], required: t.List[bytes]) -> bool:
+    # エスケープを含むストリームは展開後の文字が読めないため判定しない
+    if any(b"\\" in s for s in streams):
+        return True
+    for alts in required:
+        if not any(s.find(alts[i:i + 1]) != -1 for s in streams for i in range(len(alts))):
+            return False
+    return True
+
+
+def extract_text_per_page_fast(
+    pdf_path: str,
+    required: t.Optional[t.List[bytes]] = None,
+    skipped: t.Optional[t.List[int]] = None,
+    only: t.Optional[t.AbstractSet[int]] = None,
+) -> t.Dict[int, str]:
+    # メモリマップ上で直接スキャン（全体をbytesへコピーせず、必要な部分だけOSに読み込ませる）
+    # required を指定すると、そのバイトを含まないページはテキスト抽出を省略して空文字にする
+    # （省略したページ番号は skipped に追加）
+    # only を指定すると、そのページ番号だけを抽出して返す
     with open(pdf_path, "rb") as f:
         with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
-            data = mm[:]
-
-    # オブジェクト境界
-    objects: t.Dict[int, bytes] = {}
-    for m in _RE_OBJ.finditer(data):
+            return _extract_pages_from_buffer(mm, required, skipped, only)
+
+
+def _extract_pages_from_buffer(
+    mm: "mmap.mmap",
+    required: t.Optional[t.List[bytes]] = None,
+    skipped: t.Optional[t.List[int]] = None,
+    only: t.Optional[t.AbstractSet[int]] = None,
+) -> t.Dict[int, str]:
+    # オブジェクト境界（本体は切り出さず (開始, 終了) の位置だけ保持）
+    objects: t.Dict[int, t.Tuple[int, int]] = {}
+    # endobj はまず次のオブジェクトの開始位置までで探す（通常はここで見つかり、末尾まで走査しない）
+    # ストリーム内の "12 0 obj" のような文字列を次のオブジェクトと誤認した場合に備え、見つからなければ範囲を広げる
+    matches = list(_RE_OBJ.finditer(mm))
+    for i, m in enumerate(matches):
         obj_id = int(m.group(1))
         start = m.end()
-        end = data.find(b"endobj", start)
+        limit = matches[i + 1].start() if i + 1 < len(matches) else len(mm)
+        end = mm.find(b"endobj", start, limit)
+        if end == -1 and limit < len(mm):
+            end = mm.find(b"endobj", start)
         if end == -1:
             continue
-        objects[obj_id] = data[start:end]
+        objects[obj_id] = (start, end)
 
-    # PageとContents参照抽出
+    # PageとContents参照抽出（正規表現は範囲指定でmmapに直接かける）
     pages: t.List[int] = []
     page_contents_map: t.Dict[int, t.List[int]] = {}
-    for oid, body in objects.items():
-        if _RE_IS_PAGE.search(body):
-            pages.append(oid)
-            contents: t.List[int] = []
-            m_single = _RE_CONTENTS_SINGLE.search(body)
-            if m_single:
-                contents.append(int(m_single.group(1)))
+    for oid, (start, end) in objects.items():
+        # 巨大なオブジェクトや "/Page" を含まないものは正規表現にかける前に除外
+        if end - start > _PAGE_DICT_MAX_SIZE or mm.find(b"/Page", start, end) == -1:
+            continue
+        is_page = False
+        contents: t.List[int] = []
+        for m in _RE_PAGE_KEYS.finditer(mm, start, end):
+            if m.group(1):
+                is_page = True
+            elif m.group(2):
+                contents.append(int(m.group(2)))
             else:
-                m_arr = _RE_CONTENTS_ARRAY.search(body)
-                if m_arr:
-                    refs = _RE_INDIRECT.findall(m_arr.group(1))
-                    contents.extend([int(r) for r in refs])
+                # 配列の中身は切り出さず、元のバッファ上の範囲を指定して参照を読む
+                contents.extend(int(r.group(1)) for r in _RE_INDIRECT.finditer(mm, m.start(3), m.end(3)))
+        if is_page:
+            pages.append(oid)
             page_contents_map[oid] = contents
 
     result: t.Dict[int, str] = {}
-    page_index = 1
-    for page_oid in pages:
-        texts: t.List[str] = []
+    for page_index, page_oid in enumerate(pages, 1):
+        if only is not None and page_index not in only:
+            continue
+        streams: t.List[bytes] = []
         for cid in page_contents_map.get(page_oid, []):
-            obj_bytes = objects.get(cid)
-            if not obj_bytes:
+            span = objects.get(cid)
+            if span is None or span[0] == span[1]:
                 continue
-            for stream in _extract_streams_from_object(obj_bytes):
-                ttxt = _extract_text_from_content_stream(stream)
-                if ttxt:
-                    texts.append(ttxt)
-        result[page_index] = "\n".join(texts)
-        page_index += 1
+            # コンテンツオブジェクトだけここで初めてbytesとして切り出す
+            stream = _extract_stream_from_object(mm[span[0]:span[1]])
+            if stream is not None:
+                streams.append(stream)
+        page_text = ""
+        # テキスト描画命令のないストリーム（図形のみ等）は解析しない
+        # テキストのないページ（空白・図形のみ）は省略扱いにせず、空文字で確定させる
+        text_streams = [s for s in streams if b"BT" in s]
+        if text_streams and required and not _may_contain(text_streams, required):
+            # 検索語が現れ得ないページはBT/ETの解析自体を省く
+            if skipped is not None:
+                skipped.append(page_index)
+        elif text_streams:
+            # ページ内の全ストリームを1つのバッファに書き込み、デコードはページごとに1回だけ行う
+            buf = bytearray()
+            for stream in text_streams:
+                mark = len(buf)
+                if buf:
+                    buf += b"\n"
+                body_start = len(buf)
+                _append_stream_text(stream, buf)
+                if len(buf) == body_start:
+                    del buf[mark:]
+            try:
+                page_text = buf.decode("utf-8")
+            except UnicodeDecodeError:
+                page_text = "\n".join(filter(None, (_extract_text_from_content_stream(s) for s in text_streams)))
+        result[page_index] = page_text
     return result
 
 
+# ========== 抽出テキストのキャッシュ ==========
+# 検索語を変えて再検索する際にPDFの解析をやり直さないよう、抽出結果をディスクに保存する
+# （ワーカープロセスは検索ごとに作り直すため、プロセス内の辞書ではなくファイルで持つ）
+PAGES_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".pdfserch_cache")
+# キャッシュ全体の上限。超えた分は最近使われていないものから削除する
+PAGES_CACHE_MAX_BYTES = 512 * 1024 * 1024
+# 抽出結果の形式・内容が変わる修正をしたら上げる（古いキャッシュは使われなくなり、LRUで削除される）
+PAGES_CACHE_VERSION = "v2"
+
+PagesCacheKey = t.Tuple[str, int, int]  # (絶対パス, mtime_ns, サイズ)
+
+
+def _pages_cache_path(key: PagesCacheKey) -> str:
+    # 抽出方法が他のツールと異なるため、キーに識別子を含めて共有ディレクトリ内で区別する
+    raw = f"pdfserch4|{PAGES_CACHE_VERSION}|" + "|".join(str(k) for k in key)
+    return os.path.join(PAGES_CACHE_DIR, hashlib.sha1(raw.encode("utf-8")).hexdigest() + ".json.gz")
+
+
+def load_pages_cache(key: PagesCacheKey) -> t.Optional[t.Dict[int, t.Optional[str]]]:
+    # 値が None のページは、検索語のフィルタで抽出を省略したもの
+    path = _pages_cache_path(key)
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            pages = json.load(f)
+    except (OSError, ValueError):
+        return None
+    try:
+        # 更新日時を使用日時として扱い、削除対象の判定に使う
+        os.utime(path)
+    except OSError:
+        pass
+    return {i: text for i, text in enumerate(pages, 1)}
+
+
+def save_pages_cache(key: PagesCacheKey, pages_text: t.Dict[int, t.Optional[str]]) -> None:
+    # 失敗しても検索自体には影響させない
+    try:
+        os.makedirs(PAGES_CACHE_DIR, exist_ok=True)
+        path = _pages_cache_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump([pages_text[i] for i in sorted(pages_text)], f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[WARN] キャッシュ保存に失敗: {e}")
+
+
+def prune_pages_cache(max_bytes: int = PAGES_CACHE_MAX_BYTES) -> None:
+    # キャッシュ全体が上限を超えていれば、最近使われていないものから削除する
+    # （PDF更新で使われなくなった古いキーのエントリもここで消える）
+    entries: t.List[t.Tuple[float, int, str]] = []
+    try:
+        with os.scandir(PAGES_CACHE_DIR) as it:
+            for entry in it:
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+    except OSError:
+        return
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
 # ========== 3. メイン処理関数 ==========
 class ProcessorOptions(t.TypedDict):
     recursive: bool
     case_sensitive: bool
     use_regex: bool
+    multi_terms: bool
 
 
 class SearchResult(t.TypedDict, total=False):
@@ -234,34 +434,58 @@ class SearchResult(t.TypedDict, total=False):
     trace: str
 
 
-def _compile_pattern(search_text: str, case_sensitive: bool, use_regex: bool) -> t.Optional[re.Pattern]:
-    if not use_regex:
-        return None
+class _TermsMatcher:
+    # カンマ区切りの複数語を Aho-Corasick で1回の走査にまとめて検出する（いずれかに一致すればヒット）
+    def __init__(self, terms: t.List[str], case_sensitive: bool) -> None:
+        self.case_sensitive = case_sensitive
+        self.automaton = ahocorasick.Automaton()
+        for term in terms:
+            key = term if case_sensitive else term.lower()
+            self.automaton.add_word(key, len(key))
+        self.automaton.make_automaton()
+
+    def spans(self, text: str) -> t.List[t.Tuple[int, int]]:
+        src = text if self.case_sensitive else text.lower()
+        found = sorted((end - n + 1, -n) for end, n in self.automaton.iter(src))
+        # 正規表現の選択（長い語優先）と同じく、重なった一致は先に始まる長い方だけを残す
+        spans: t.List[t.Tuple[int, int]] = []
+        last_end = 0
+        for start, neg_n in found:
+            if start < last_end:
+                continue
+            last_end = start - neg_n
+            spans.append((start, last_end))
+        return spans
+
+
+Matcher = t.Union[re.Pattern, _TermsMatcher]
+
+
+def _split_terms(search_text: str, use_regex: bool, multi_terms: bool) -> t.List[str]:
+    # 複数語の指定時だけカンマ区切りで分ける（"1,000円" などをそのまま1語で探せるよう既定は分割しない）
+    if use_regex or not multi_terms:
+        return [search_text]
+    terms = (w.strip() for w in search_text.split(","))
+    return list(dict.fromkeys(w for w in terms if w)) or [search_text]
+
+
+def _compile_pattern(search_text: str, case_sensitive: bool, use_regex: bool, multi_terms: bool = False) -> Matcher:
+    # 通常の文字列もエスケープして正規表現にする
+    # （reのリテラル最適化が効き、大文字小文字を無視する場合もページ全体の lower() コピーが不要）
     flags = 0 if case_sensitive else re.IGNORECASE
-    return re.compile(search_text, flags)
+    if use_regex:
+        return re.compile(search_text, flags)
+    terms = _split_terms(search_text, use_regex, multi_terms)
+    if len(terms) > 1 and ahocorasick is not None:
+        return _TermsMatcher(terms, case_sensitive)
+    # 長い語を先に並べ、同じ位置では長い方に一致させる
+    return re.compile("|".join(re.escape(w) for w in sorted(terms, key=len, reverse=True)), flags)
 
 
-def _find_matches_in_text(text: str, search_text: str, case_sensitive: bool, patt: t.Optional[re.Pattern]) -> t.List[t.Tuple[int, int]]:
-    spans: t.List[t.Tuple[int, int]] = []
-    if patt is not None:
-        for m in patt.finditer(text):
-            spans.append((m.start(), m.end()))
-        return spans
-    if case_sensitive:
-        idx = text.find(search_text)
-        L = len(search_text)
-        while idx != -1:
-            spans.append((idx, idx + L))
-            idx = text.find(search_text, idx + 1)
-    else:
-        tgt = search_text.lower()
-        src = text.lower()
-        L = len(tgt)
-        idx = src.find(tgt)
-        while idx != -1:
-            spans.append((idx, idx + L))
-            idx = src.find(tgt, idx + 1)
-    return spans
+def _find_matches_in_text(text: str, patt: Matcher) -> t.List[t.Tuple[int, int]]:
+    if isinstance(patt, _TermsMatcher):
+        return patt.spans(text)
+    return [m.span() for m in patt.finditer(text)]
 
 
 def _make_snippet(text: str, span: t.Tuple[int, int], context: int = 30) -> str:
@@ -276,28 +500,53 @@ def _make_snippet(text: str, span: t.Tuple[int, int], context: int = 30) -> str:
     return snippet
 
 
-def _worker_search_file(
-    fpath: str,
-    search_text: str,
-    case_sensitive: bool,
-    patt: t.Optional[re.Pattern],
-    cancel_event: threading.Event,
-) -> t.Tuple[t.List[SearchResult], t.List[SearchResult]]:
+# ワーカープロセスごとに1回だけ用意する検索条件（_init_worker で設定）
+_G_PATT: t.Optional[Matcher] = None
+_G_REQUIRED: t.Optional[t.List[bytes]] = None
+
+
+def _init_worker(search_text: str, case_sensitive: bool, use_regex: bool, multi_terms: bool) -> None:
+    # 各ワーカープロセスの起動時に1回だけパターンをコンパイルし、タスクごとの受け渡しをなくす
+    global _G_PATT, _G_REQUIRED
+    _G_PATT = _compile_pattern(search_text, case_sensitive, use_regex, multi_terms)
+    # 正規表現でなければ、検索語の文字を含まないページの抽出を省略できる
+    _G_REQUIRED = (
+        None if use_regex
+        else _required_bytes(_split_terms(search_text, use_regex, multi_terms), case_sensitive)
+    )
+
+
+def _worker_search_file(fpath: str) -> t.Tuple[t.List[SearchResult], t.List[SearchResult]]:
+    # 別プロセスで実行されるため、戻り値はpickle可能なものに限る
+    patt = _G_PATT
+    required = _G_REQUIRED
     res: t.List[SearchResult] = []
     err: t.List[SearchResult] = []
 
-    if cancel_event.is_set():
-        return res, err
-
     try:
-        pages_text = extract_text_per_page_fast(fpath)
-        for page_no, page_text in pages_text.items():
-            if cancel_event.is_set():
-                break
+        # 前回までの検索で抽出済みならキャッシュを使い、PDFの解析を丸ごと省く
+        st = os.stat(fpath)
+        key = (os.path.abspath(fpath), st.st_mtime_ns, st.st_size)
+        # 検索語のフィルタで抽出を省略したページはキャッシュ上 None とし、必要になった時点で抽出する
+        cached = load_pages_cache(key)
+        if cached is None:
+            skipped: t.List[int] = []
+            extracted = extract_text_per_page_fast(fpath, required, skipped)
+            cached = {i: (None if i in skipped else text) for i, text in extracted.items()}
+            save_pages_cache(key, cached)
+        else:
+            missing = {i for i, text in cached.items() if text is None}
+            if missing:
+                skipped = []
+                extracted = extract_text_per_page_fast(fpath, required, skipped, only=missing)
+                filled = {i: text for i, text in extracted.items() if i not in skipped}
+                if filled:
+                    cached.update(filled)
+                    save_pages_cache(key, cached)
+        for page_no, page_text in cached.items():
             if not page_text:
                 continue
-            spans = _find_matches_in_text(page_text, search_text, case_sensitive, patt)
-            for sp in spans:
+            for sp in _find_matches_in_text(page_text, patt):
                 res.append(
                     {
                         "file": fpath,
@@ -323,42 +572,53 @@ def main_processor(
     progress_cb: t.Callable[[int, int, str], None],
     cancel_flag: t.Callable[[], bool],
     log_cb: t.Callable[[str], None],
+    result_cb: t.Optional[t.Callable[[t.List[SearchResult]], None]] = None,
 ) -> t.Tuple[t.List[SearchResult], t.List[SearchResult]]:
+    # result_cb を指定するとヒットはファイルごとに逐次渡し、戻り値の結果リストには溜めない
     total = len(files)
     results: t.List[SearchResult] = []
     errors: t.List[SearchResult] = []
 
-    patt = _compile_pattern(search_text, options.get("case_sensitive", False), options.get("use_regex", False))
+    case_sensitive = options.get("case_sensitive", False)
+    use_regex = options.get("use_regex", False)
+    multi_terms = options.get("multi_terms", False)
+    # 不正な正規表現はワーカー起動前にここでエラーにする
+    _compile_pattern(search_text, case_sensitive, use_regex, multi_terms)
+    prune_pages_cache()
 
-    # 並列数はCPUコア×2を上限に調整
-    max_workers = max(2, min(32, (os.cpu_count() or 4) * 2))
+    # CPU処理なのでプロセス数はコア数まで（それ以上増やしても切り替えコストが増えるだけ）
+    max_workers = os.cpu_count() or 4
+    if sys.platform == "win32":
+        # WindowsのProcessPoolExecutorは61プロセスまで（超えるとValueError）
+        max_workers = min(61, max_workers)
 
     done = 0
     progress_cb(0, total, "検索開始")
 
-    # スレッド並列（zlibやreでGIL解放が多く有利）
-    cancel_event = threading.Event()
-
-    def _cancel_check() -> bool:
-        if cancel_flag():
-            cancel_event.set()
-            return True
-        return False
-
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
+    # プロセス並列（文字列のエスケープ解除やオブジェクト解析はGILを握る純Python処理のため）
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(search_text, case_sensitive, use_regex, multi_terms),
+    ) as ex:
         future_map = {
-            ex.submit(_worker_search_file, f, search_text, options.get("case_sensitive", False), patt, cancel_event): f
+            ex.submit(_worker_search_file, f): f
             for f in files
         }
         for fut in concurrent.futures.as_completed(future_map):
-            if _cancel_check():
+            if cancel_flag():
+                # 未着手のファイルは破棄し、実行中のものだけ完了を待つ
+                ex.shutdown(wait=False, cancel_futures=True)
                 log_cb("ユーザーによりキャンセルされました")
                 break
             fpath = future_map[fut]
             try:
                 res, err = fut.result()
                 if res:
-                    results.extend(res)
+                    if result_cb is not None:
+                        result_cb(res)
+                    else:
+                        results.extend(res)
                 if err:
                     errors.extend(err)
             except Exception as e:
@@ -376,7 +636,34 @@ def main_processor(
     return results, errors
 
 
+def _scan_pdf_files(folder: str, recursive: bool) -> t.List[t.Tuple[int, str]]:
+    # os.scandir でフォルダを走査し (サイズ, パス) を返す
+    # 種別判定はディレクトリエントリの情報で済み、サイズもエントリから取る（Windowsでは追加のstat不要）
+    found: t.List[t.Tuple[int, str]] = []
+    stack = [folder]
+    while stack:
+        d = stack.pop()
+        try:
+            with os.scandir(d) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                stack.append(entry.path)
+                        elif entry.name.lower().endswith(".pdf") and entry.is_file():
+                            found.append((entry.stat().st_size, entry.path))
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return found
+
+
 # ========== 4. GUIクラス ==========
+# Treeviewへ一度に追加する結果件数（大量ヒット時はスクロールに応じて追加表示）
+_TREE_PAGE_SIZE = 500
+
+
 class PdfSearchApp(tk.Tk):
     def __init__(self) -> None:
         super().__init__()
@@ -392,12 +679,15 @@ class PdfSearchApp(tk.Tk):
         self.var_recursive = tk.BooleanVar(value=True)
         self.var_case = tk.BooleanVar(value=False)
         self.var_regex = tk.BooleanVar(value=False)
+        self.var_multi = tk.BooleanVar(value=False)
         self.var_status = tk.StringVar(value="準備完了")
+        self.var_count = tk.StringVar(value="")
 
         self._thread: t.Optional[threading.Thread] = None
         self._cancel_event = threading.Event()
         self._ui_queue: "queue.Queue[t.Tuple[str, t.Any]]" = queue.Queue()
         self._results: t.List[SearchResult] = []
+        self._shown_count = 0  # Treeviewに表示済みの件数（残りはスクロールに応じて追加表示）
         self._errors: t.List[SearchResult] = []
 
         self._build_ui()
@@ -431,6 +721,7 @@ class PdfSearchApp(tk.Tk):
         ttk.Checkbutton(row3, text="サブフォルダも検索", variable=self.var_recursive).pack(side="left", padx=6)
         ttk.Checkbutton(row3, text="大文字小文字を区別", variable=self.var_case).pack(side="left", padx=6)
         ttk.Checkbutton(row3, text="正規表現を使用", variable=self.var_regex).pack(side="left", padx=6)
+        ttk.Checkbutton(row3, text="カンマ区切りで複数語", variable=self.var_multi).pack(side="left", padx=6)
 
         row4 = ttk.Frame(frm_top)
         row4.pack(fill="x", **pad)
@@ -446,6 +737,7 @@ class PdfSearchApp(tk.Tk):
         self.prog = ttk.Progressbar(row5, orient="horizontal", mode="determinate")
         self.prog.pack(fill="x", expand=True, side="left")
         ttk.Label(row5, textvariable=self.var_status, anchor="w").pack(side="left", padx=8)
+        ttk.Label(row5, textvariable=self.var_count, anchor="e").pack(side="left", padx=8)
 
         frm_res = ttk.LabelFrame(self, text="検索結果（左ダブルクリックで該当ページを開く）")
         frm_res.pack(fill="both", expand=True, **pad)
@@ -460,7 +752,8 @@ class PdfSearchApp(tk.Tk):
         self.tree.column("snippet", width=520, anchor="w")
         vsb = ttk.Scrollbar(frm_res, orient="vertical", command=self.tree.yview)
         hsb = ttk.Scrollbar(frm_res, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscroll=vsb.set, xscroll=hsb.set)
+        self._vsb = vsb
+        self.tree.configure(yscroll=self._on_tree_yscroll, xscroll=hsb.set)
         self.tree.pack(side="left", fill="both", expand=True)
         vsb.pack(side="right", fill="y")
         hsb.pack(side="bottom", fill="x")
@@ -497,6 +790,7 @@ class PdfSearchApp(tk.Tk):
             self.var_recursive.set(bool(settings.get("recursive", True)))
             self.var_case.set(bool(settings.get("case_sensitive", False)))
             self.var_regex.set(bool(settings.get("use_regex", False)))
+            self.var_multi.set(bool(settings.get("multi_terms", False)))
             self.var_status.set("設定を読み込みました")
         except Exception as e:
             messagebox.showerror("エラー", f"設定の読み込みに失敗しました: {e}")
@@ -519,6 +813,7 @@ class PdfSearchApp(tk.Tk):
                 "recursive": self.var_recursive.get(),
                 "case_sensitive": self.var_case.get(),
                 "use_regex": self.var_regex.get(),
+                "multi_terms": self.var_multi.get(),
             }
             save_ini(path, settings)
             self.var_status.set("設定を保存しました")
@@ -533,6 +828,7 @@ class PdfSearchApp(tk.Tk):
         self.var_recursive.set(bool(s.get("recursive", True)))
         self.var_case.set(bool(s.get("case_sensitive", False)))
         self.var_regex.set(bool(s.get("use_regex", False)))
+        self.var_multi.set(bool(s.get("multi_terms", False)))
 
     # ---------- 実行フロー ----------
     def _collect_files(self) -> t.List[str]:
@@ -541,26 +837,21 @@ class PdfSearchApp(tk.Tk):
         fpath = self.var_file.get().strip()
         recursive = self.var_recursive.get()
 
+        # (サイズ, パス) で集め、サイズは走査時に取得したものを並べ替えに使う
+        sized: t.List[t.Tuple[int, str]] = []
         if folder and os.path.isdir(folder):
-            if recursive:
-                for root, _, fnames in os.walk(folder):
-                    for n in fnames:
-                        if n.lower().endswith(".pdf"):
-                            files.append(os.path.join(root, n))
-            else:
-                for n in os.listdir(folder):
-                    if n.lower().endswith(".pdf"):
-                        files.append(os.path.join(folder, n))
+            sized.extend(_scan_pdf_files(folder, recursive))
 
         if fpath and os.path.isfile(fpath) and fpath.lower().endswith(".pdf"):
-            if fpath not in files:
-                files.append(fpath)
+            if all(p != fpath for _, p in sized):
+                try:
+                    sized.append((os.path.getsize(fpath), fpath))
+                except OSError:
+                    sized.append((0, fpath))
 
         # 小さいファイルを先に処理（体感速度向上）
-        try:
-            files.sort(key=lambda p: os.path.getsize(p))
-        except Exception:
-            pass
+        sized.sort(key=lambda sp: sp[0])
+        files = [p for _, p in sized]
         return files
 
     def _validate_inputs(self) -> bool:
@@ -575,10 +866,11 @@ class PdfSearchApp(tk.Tk):
         return True
 
     def _clear_results(self) -> None:
-        for i in self.tree.get_children():
-            self.tree.delete(i)
+        self.tree.delete(*self.tree.get_children())
         self._results = []
+        self._shown_count = 0
         self._errors = []
+        self.var_count.set("")
 
     def _on_run(self) -> None:
         if not self._validate_inputs():
@@ -594,6 +886,7 @@ class PdfSearchApp(tk.Tk):
             "recursive": self.var_recursive.get(),
             "case_sensitive": self.var_case.get(),
             "use_regex": self.var_regex.get(),
+            "multi_terms": self.var_multi.get(),
         }
         search_text = self.var_search.get().strip()
 
@@ -612,10 +905,14 @@ class PdfSearchApp(tk.Tk):
         def log_cb(msg: str) -> None:
             self._ui_queue.put(("log", msg))
 
+        def result_cb(rows: t.List[SearchResult]) -> None:
+            # ヒットはファイル単位で逐次UIへ送る
+            self._ui_queue.put(("result_rows", rows))
+
         def worker() -> None:
             try:
-                results, errors = main_processor(files, search_text, opts, progress_cb, cancel_flag, log_cb)
-                self._ui_queue.put(("result_all", (results, errors)))
+                _, errors = main_processor(files, search_text, opts, progress_cb, cancel_flag, log_cb, result_cb)
+                self._ui_queue.put(("result_all", errors))
             except Exception as e:
                 self._ui_queue.put(("fatal", f"致命的エラー: {e}\n{traceback.format_exc()}"))
 
@@ -651,43 +948,72 @@ class PdfSearchApp(tk.Tk):
         except Exception as e:
             messagebox.showerror("エラー", f"PDFを開けませんでした: {e}")
 
-    def _append_result_row(self, row: SearchResult) -> None:
-        self.tree.insert("", "end", values=(row["file"], row["page"], row["snippet"]))
-        self._results.append(row)
+    def _append_result_rows(self, rows: t.List[SearchResult]) -> None:
+        # 結果はまず保持だけして、Treeviewには表示上限まで追加する
+        self._results.extend(rows)
+        if self._shown_count < _TREE_PAGE_SIZE:
+            self._show_more_rows(_TREE_PAGE_SIZE - self._shown_count)
+        elif self.tree.yview()[1] >= 0.98:
+            # 既に末尾までスクロール済みだとスクロールイベントが来ないため、ここで次の分を追加する
+            self._show_more_rows()
+        self._update_count_label()
+
+    def _show_more_rows(self, count: int = _TREE_PAGE_SIZE) -> None:
+        rows = self._results[self._shown_count:self._shown_count + count]
+        if not rows:
+            return
+        insert = self.tree.insert
+        for row in rows:
+            insert("", "end", values=(row["file"], row["page"], row["snippet"]))
+        self._shown_count += len(rows)
+        self._update_count_label()
+
+    def _update_count_label(self) -> None:
+        # 進捗メッセージとは別に、表示済みの件数と全ヒット件数を出す
+        self.var_count.set(f"表示 {self._shown_count} / 全 {len(self._results)} 件")
+
+    def _on_tree_yscroll(self, first: str, last: str) -> None:
+        self._vsb.set(first, last)
+        # 末尾付近までスクロールされたら、未表示の結果を次の分だけ追加する
+        if float(last) >= 0.98 and self._shown_count < len(self._results):
+            self.after_idle(self._show_more_rows)
 
     def _append_error(self, err: SearchResult) -> None:
         self._errors.append(err)
 
     def _drain_ui_queue(self) -> None:
+        # バッチ処理でUI更新を抑制（1回の周期で届いた結果をまとめて表示）
+        batch_results: t.List[SearchResult] = []
+        deadline = time.monotonic() + 0.05
         try:
-            # バッチ処理でUI更新を抑制
-            batch_results: t.List[SearchResult] = []
-            while True:
+            while time.monotonic() < deadline:
                 kind, payload = self._ui_queue.get_nowait()
-                if kind == "progress":
+                if kind == "result_rows":
+                    batch_results.extend(payload)
+                elif kind == "progress":
                     done, total, msg = payload
                     self.prog.configure(maximum=total, value=done)
                     self.var_status.set(msg)
                 elif kind == "log":
                     print(f"[LOG] {payload}")
                 elif kind == "result_all":
-                    results, errors = payload
-                    batch_results.extend(results)
-                    for r in batch_results:
-                        self._append_result_row(r)
+                    errors = payload
+                    self._append_result_rows(batch_results)
+                    batch_results.clear()
                     for e in errors:
                         self._append_error(e)
                     self.btn_cancel.configure(state="disabled")
                     self.var_status.set("3. 出力と完了メッセージ表示")
                     messagebox.showinfo("完了", "検索が完了しました。")
-                    print(f"[INFO] 検索完了: ヒット件数={len(results)} エラー件数={len(errors)}")
-                    batch_results.clear()
+                    print(f"[INFO] 検索完了: ヒット件数={len(self._results)} エラー件数={len(errors)}")
                 elif kind == "fatal":
                     self.btn_cancel.configure(state="disabled")
                     messagebox.showerror("致命的エラー", str(payload))
                     self.var_status.set("エラー終了")
         except queue.Empty:
             pass
+        if batch_results:
+            self._append_result_rows(batch_results)
         # 100ms周期で更新
         self.after(100, self._drain_ui_queue)
 
@@ -705,9 +1031,9 @@ class PdfSearchApp(tk.Tk):
         if not path:
             return
         try:
-            wb = Workbook()
-            ws1 = wb.active
-            ws1.title = "results"
+            # write_onlyモードで行を逐次書き出す（セルをメモリに保持しない）
+            wb = Workbook(write_only=True)
+            ws1 = wb.create_sheet("results")
             ws1.append(["file", "page", "snippet"])
             for r in self._results:
                 ws1.append([r.get("file", ""), r.get("page", ""), r.get("snippet", "")])
@@ -726,5 +1052,7 @@ class PdfSearchApp(tk.Tk):
 
 # ========== 5. GUI起動 ==========
 if __name__ == "__main__":
+    # PyInstallerでexe化した場合にワーカープロセスがGUIを再起動しないようにする
+    multiprocessing.freeze_support()
     app = PdfSearchApp()
     app.mainloop()
\ No newline at end of file